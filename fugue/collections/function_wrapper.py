@@ -22,6 +22,9 @@ from ..exceptions import FuguePluginsRegistrationError
 
 _REGISTERED: List[Tuple[Type["AnnotatedParam"], Any, str, Callable[[Any], bool]]] = []
 _REGISTERED_CODES: Dict[str, Any] = {}
+_MATCHED_TYPES: Dict[Any, Optional[Type["AnnotatedParam"]]] = {}
+_MATCHED_TYPES_MAX_SIZE = 1024
+_MISSING = object()
 
 
 class FunctionWrapper(object):
@@ -78,6 +81,8 @@ class FunctionWrapper(object):
 
 
 class AnnotatedParam:
+    __slots__ = ("required", "default", "annotation", "code")
+
     def __init__(self, param: Optional[inspect.Parameter]):
         if param is not None:
             self.required = param.default == inspect.Parameter.empty
@@ -152,7 +157,10 @@ def annotated_param(  # noqa: C901
                 _REGISTERED_CODES[tp._code] = tp
             else:
                 _REGISTERED_CODES[tp._code] = None
+        # append before clearing, so lookups scanning the old registry can
+        # detect the change by its size and won't cache stale results
         _REGISTERED.append((tp, annotation, code, _matcher))
+        _MATCHED_TYPES.clear()
 
         return tp
 
@@ -175,9 +183,9 @@ def parse_annotation(
 
     load_entry_point(FUGUE_ENTRYPOINT)
 
-    for tp, _, _, matcher in _REGISTERED:
-        if matcher(annotation):
-            return tp(param)
+    tp = _find_registered_type(annotation)
+    if tp is not None:
+        return tp(param)
 
     if param is not None and param.kind == param.VAR_POSITIONAL:
         return _PositionalParam(param)
@@ -186,9 +194,35 @@ def parse_annotation(
     return _OtherParam(param)
 
 
+def _find_registered_type(annotation: Any) -> Optional[Type[AnnotatedParam]]:
+    # matchers are pure functions of the annotation, so the result of the
+    # linear scan of the registry can be reused by later wrappers
+    try:
+        # a single lookup, registrations on other threads may clear the cache
+        cached = _MATCHED_TYPES.get(annotation, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        hashable = True
+    except TypeError:  # unhashable annotation can't be cached
+        hashable = False
+    size = len(_REGISTERED)  # the registry is append only
+    res: Optional[Type[AnnotatedParam]] = None
+    for tp, _, _, matcher in _REGISTERED:
+        if matcher(annotation):
+            res = tp
+            break
+    if hashable:
+        if len(_MATCHED_TYPES) >= _MATCHED_TYPES_MAX_SIZE:
+            _MATCHED_TYPES.clear()
+        _MATCHED_TYPES[annotation] = res
+        if size != len(_REGISTERED):  # the registry changed during the scan
+            _MATCHED_TYPES.pop(annotation, None)
+    return res
+
+
 @annotated_param("NoneType", "n", lambda a: False)
 class _NoneParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 @annotated_param(
@@ -201,7 +235,7 @@ class _NoneParam(AnnotatedParam):
     ),
 )
 class _CallableParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 @annotated_param(
@@ -215,24 +249,24 @@ class _CallableParam(AnnotatedParam):
     ),
 )
 class _OptionalCallableParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 @annotated_param("[Self]", "0", lambda a: False)
 class _SelfParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 @annotated_param("[Other]", "x", lambda a: False)
 class _OtherParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 @annotated_param("[Positional]", "y", lambda a: False)
 class _PositionalParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 @annotated_param("[Keyword]", "z", lambda a: False)
 class _KeywordParam(AnnotatedParam):
-    pass
+    __slots__ = ()
@@ -28,6 +28,8 @@ from .api import (
 )
 from .dataframe import DataFrame, LocalBoundedDataFrame, _input_schema
 
+_ITER_BATCH_SIZE = 8192
+
 
 class ArrowDataFrame(LocalBoundedDataFrame):
     """DataFrame that wraps :func:`pyarrow.Table <pa:pyarrow.table>`. Please also read
@@ -237,10 +239,13 @@ class ArrowDataFrame(LocalBoundedDataFrame):
             for x in self[columns].as_array_iterable(type_safe=type_safe):
                 yield x
         else:
-            d = self.native.to_pydict()
-            cols = [d[n] for n in self.columns]
-            for arr in zip(*cols):
-                yield list(arr)
+            # converting batch by batch bounds the number of python objects
+            # alive at a time, and rows are yielded before the full conversion
+            for batch in self.native.to_batches(max_chunksize=_ITER_BATCH_SIZE):
+                d = batch.to_pydict()
+                cols = [d[n] for n in self.columns]
+                for arr in zip(*cols):
+                    yield list(arr)
 
 
 @as_local.candidate(lambda df: isinstance(df, pa.Table))
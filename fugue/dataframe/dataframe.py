@@ -243,9 +243,8 @@ class DataFrame(Dataset):
         """
         if columns is None:
             columns = self.columns
-        idx = range(len(columns))
         for x in self.as_array_iterable(columns, type_safe=True):
-            yield {columns[i]: x[i] for i in idx}
+            yield dict(zip(columns, x))
 
     def get_info_str(self) -> str:
         """Get dataframe information (schema, type, metadata) as json string
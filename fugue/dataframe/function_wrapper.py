@@ -1,5 +1,17 @@
 import inspect
-from typing import Any, Dict, Iterable, Iterator, List, Optional, no_type_check
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sized,
+    Tuple,
+    no_type_check,
+)
 
 import pandas as pd
 import pyarrow as pa
@@ -23,16 +35,46 @@ from .pandas_dataframe import PandasDataFrame
 from .utils import to_local_df
 
 
+_MISSING = object()
+
+
 class DataFrameFunctionWrapper(FunctionWrapper):
+    def __init__(
+        self,
+        func: Callable,
+        params_re: str = ".*",
+        return_re: str = ".*",
+    ):
+        super().__init__(func, params_re, return_re)
+        # the parameter classification is fixed after parsing, so it is
+        # computed once here to keep the per call logic in run minimal
+        self._param_keys = tuple(self._params.keys())
+        self._has_kw = any(isinstance(v, _KeywordParam) for v in self._params.values())
+        input_params = [
+            (k, v)
+            for k, v in self._params.items()
+            if not isinstance(v, (_PositionalParam, _KeywordParam))
+        ]
+        self._df_params: Tuple[Tuple[str, _DataFrameParamBase], ...] = tuple(
+            (k, v) for k, v in input_params if isinstance(v, _DataFrameParamBase)
+        )
+        self._other_param_keys = tuple(
+            k for k, v in input_params if not isinstance(v, _DataFrameParamBase)
+        )
+        self._required_keys = tuple(k for k, v in input_params if v.required)
+        self._df_rt: Optional[_DataFrameParamBase] = (
+            self._rt if isinstance(self._rt, _DataFrameParamBase) else None
+        )
+        self._format_hint = self._parse_format_hint()
+
     @property
     def need_output_schema(self) -> Optional[bool]:
-        return (
-            self._rt.need_schema()
-            if isinstance(self._rt, _DataFrameParamBase)
-            else False
-        )
+        return False if self._df_rt is None else self._df_rt.need_schema()
 
     def get_format_hint(self) -> Optional[str]:
+        return self._format_hint
+
+    def _parse_format_hint(self) -> Optional[str]:
         for v in self._params.values():
             if isinstance(v, _DataFrameParamBase):
                 if v.format_hint() is not None:
@@ -50,43 +92,63 @@ class DataFrameFunctionWrapper(FunctionWrapper):
         output: bool = True,
         ctx: Any = None,
     ) -> Any:
-        p: Dict[str, Any] = {}
-        for i in range(len(args)):
-            p[self._params.get_key_by_index(i)] = args[i]
+        if len(args) > len(self._param_keys):
+            raise ValueError(f"{args} are more than the parameters {self._params}")
+        p: Dict[str, Any] = dict(zip(self._param_keys, args))
         p.update(kwargs)
-        has_kw = False
-        rargs: Dict[str, Any] = {}
-        for k, v in self._params.items():
-            if isinstance(v, (_PositionalParam, _KeywordParam)):
-                if isinstance(v, _KeywordParam):
-                    has_kw = True
-            elif k in p:
-                if isinstance(v, _DataFrameParamBase):
-                    assert_or_throw(
-                        isinstance(p[k], DataFrame),
-                        lambda: TypeError(f"{p[k]} is not a DataFrame"),
-                    )
-                    rargs[k] = v.to_input_data(p[k], ctx=ctx)
-                else:
-                    rargs[k] = p[k]  # TODO: should we do auto type conversion?
-                del p[k]
-            elif v.required:
+        for k in self._required_keys:
+            if k not in p:
                 raise ValueError(f"{k} is required by not given")
-        if has_kw:
-            rargs.update(p)
-        elif not ignore_unknown and len(p) > 0:
-            raise ValueError(f"{p} are not acceptable parameters")
+        rargs: Dict[str, Any] = {}
+        for k, param in self._df_params:
+            v = p.get(k, _MISSING)
+            if v is not _MISSING:
+                if not isinstance(v, DataFrame):
+                    raise TypeError(f"{v} is not a DataFrame")
+                rargs[k] = param.to_input_data(v, ctx=ctx)
+        for k in self._other_param_keys:
+            v = p.get(k, _MISSING)
+            if v is not _MISSING:
+                rargs[k] = v  # TODO: should we do auto type conversion?
+        # every key of rargs comes from p, so the sizes tell if anything is left
+        if len(p) > len(rargs) and (self._has_kw or not ignore_unknown):
+            left = {k: v for k, v in p.items() if k not in rargs}
+            if not self._has_kw:
+                raise ValueError(f"{left} are not acceptable parameters")
+            rargs.update(left)
         rt = self._func(**rargs)
+        if self._df_rt is None:
+            return rt if output else None
         if not output:
-            if isinstance(self._rt, _DataFrameParamBase):
-                self._rt.count(rt)
+            self._df_rt.count(rt)
             return
-        if isinstance(self._rt, _DataFrameParamBase):
-            return self._rt.to_output_df(rt, output_schema, ctx=ctx)
-        return rt
+        return self._df_rt.to_output_df(rt, output_schema, ctx=ctx)
+
+
+def _count_iterable(df: Iterable[Any]) -> int:
+    if isinstance(df, Sized):  # e.g. a list returned for an Iterable annotation
+        return len(df)
+    return sum(1 for _ in df)
+
+
+def _dicts_to_arrays(
+    dicts: Iterable[Dict[str, Any]], names: List[str]
+) -> Iterable[List[Any]]:
+    # names are resolved once, and with multiple columns a single
+    # itemgetter call fetches all values of a row
+    if len(names) > 1:
+        getter = itemgetter(*names)
+        for row in dicts:
+            yield list(getter(row))
+    else:
+        _names = tuple(names)
+        for row in dicts:
+            yield [row[n] for n in _names]
 
 
 class _DataFrameParamBase(AnnotatedParam):
+    __slots__ = ()
+
     def __init__(self, param: Optional[inspect.Parameter]):
         super().__init__(param)
         assert_or_throw(self.required, lambda: TypeError(f"{self} must be required"))
@@ -111,50 +173,50 @@ class _DataFrameParamBase(AnnotatedParam):
 
 @annotated_param(DataFrame, "d", child_can_reuse_code=True)
 class DataFrameParam(_DataFrameParamBase):
+    __slots__ = ()
+
     def to_input_data(self, df: DataFrame, ctx: Any) -> Any:
         return df
 
     def to_output_df(self, output: Any, schema: Any, ctx: Any) -> DataFrame:
-        assert_or_throw(
-            schema is None or output.schema == schema,
-            lambda: f"Output schema mismatch {output.schema} vs {schema}",
-        )
+        if not (schema is None or output.schema is schema or output.schema == schema):
+            raise AssertionError(f"Output schema mismatch {output.schema} vs {schema}")
         return output
 
     def count(self, df: Any) -> int:
         if df.is_bounded:
             return df.count()
-        else:
-            return sum(1 for _ in df.as_array_iterable())
+        if isinstance(df, LocalDataFrameIterableDataFrame):
+            # bounded sub dataframes can be counted without iterating rows
+            return sum(self.count(sub) for sub in df.native)
+        return sum(1 for _ in df.as_array_iterable())
 
 
 @annotated_param(LocalDataFrame, "l", child_can_reuse_code=True)
 class LocalDataFrameParam(DataFrameParam):
+    __slots__ = ()
+
     def to_input_data(self, df: DataFrame, ctx: Any) -> LocalDataFrame:
         return to_local_df(df)
 
     def to_output_df(self, output: LocalDataFrame, schema: Any, ctx: Any) -> DataFrame:
-        assert_or_throw(
-            schema is None or output.schema == schema,
-            lambda: f"Output schema mismatch {output.schema} vs {schema}",
-        )
+        if not (schema is None or output.schema is schema or output.schema == schema):
+            raise AssertionError(f"Output schema mismatch {output.schema} vs {schema}")
         return output
 
-    def count(self, df: LocalDataFrame) -> int:
-        if df.is_bounded:
-            return df.count()
-        else:
-            return sum(1 for _ in df.as_array_iterable())
-
 
 @annotated_param("[NoSchema]", "s", matcher=lambda x: False, child_can_reuse_code=True)
 class _LocalNoSchemaDataFrameParam(LocalDataFrameParam):
+    __slots__ = ()
+
     def need_schema(self) -> Optional[bool]:
         return True
 
 
 @annotated_param(List[List[Any]])
 class _ListListParam(_LocalNoSchemaDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(self, df: DataFrame, ctx: Any) -> List[List[Any]]:
         return df.as_array(type_safe=True)
@@ -173,6 +235,8 @@ class _ListListParam(_LocalNoSchemaDataFrameParam):
     matcher=lambda x: x == Iterable[List[Any]] or x == Iterator[List[Any]],
 )
 class _IterableListParam(_LocalNoSchemaDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(self, df: DataFrame, ctx: Any) -> Iterable[List[Any]]:
         return df.as_array_iterable(type_safe=True)
@@ -185,11 +249,13 @@ class _IterableListParam(_LocalNoSchemaDataFrameParam):
 
     @no_type_check
     def count(self, df: Iterable[List[Any]]) -> int:
-        return sum(1 for _ in df)
+        return _count_iterable(df)
 
 
 @annotated_param(EmptyAwareIterable[List[Any]])
 class _EmptyAwareIterableListParam(_LocalNoSchemaDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(self, df: DataFrame, ctx: Any) -> EmptyAwareIterable[List[Any]]:
         return make_empty_aware(df.as_array_iterable(type_safe=True))
@@ -202,11 +268,13 @@ class _EmptyAwareIterableListParam(_LocalNoSchemaDataFrameParam):
 
     @no_type_check
     def count(self, df: EmptyAwareIterable[List[Any]]) -> int:
-        return sum(1 for _ in df)
+        return _count_iterable(df)
 
 
 @annotated_param(List[Dict[str, Any]])
 class _ListDictParam(_LocalNoSchemaDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(self, df: DataFrame, ctx: Any) -> List[Dict[str, Any]]:
         return list(to_local_df(df).as_dict_iterable())
@@ -216,12 +284,7 @@ class _ListDictParam(_LocalNoSchemaDataFrameParam):
         self, output: List[Dict[str, Any]], schema: Any, ctx: Any
     ) -> DataFrame:
         schema = schema if isinstance(schema, Schema) else Schema(schema)
-
-        def get_all() -> Iterable[List[Any]]:
-            for row in output:
-                yield [row[x] for x in schema.names]
-
-        return IterableDataFrame(get_all(), schema)
+        return ArrayDataFrame(list(_dicts_to_arrays(output, schema.names)), schema)
 
     @no_type_check
     def count(self, df: List[Dict[str, Any]]) -> int:
@@ -233,6 +296,8 @@ class _ListDictParam(_LocalNoSchemaDataFrameParam):
     matcher=lambda x: x == Iterable[Dict[str, Any]] or x == Iterator[Dict[str, Any]],
 )
 class _IterableDictParam(_LocalNoSchemaDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(self, df: DataFrame, ctx: Any) -> Iterable[Dict[str, Any]]:
         return df.as_dict_iterable()
@@ -242,20 +307,17 @@ class _IterableDictParam(_LocalNoSchemaDataFrameParam):
         self, output: Iterable[Dict[str, Any]], schema: Any, ctx: Any
     ) -> DataFrame:
         schema = schema if isinstance(schema, Schema) else Schema(schema)
-
-        def get_all() -> Iterable[List[Any]]:
-            for row in output:
-                yield [row[x] for x in schema.names]
-
-        return IterableDataFrame(get_all(), schema)
+        return IterableDataFrame(_dicts_to_arrays(output, schema.names), schema)
 
     @no_type_check
     def count(self, df: Iterable[Dict[str, Any]]) -> int:
-        return sum(1 for _ in df)
+        return _count_iterable(df)
 
 
 @annotated_param(EmptyAwareIterable[Dict[str, Any]])
 class _EmptyAwareIterableDictParam(_LocalNoSchemaDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(
         self, df: DataFrame, ctx: Any
@@ -267,20 +329,17 @@ class _EmptyAwareIterableDictParam(_LocalNoSchemaDataFrameParam):
         self, output: EmptyAwareIterable[Dict[str, Any]], schema: Any, ctx: Any
     ) -> DataFrame:
         schema = schema if isinstance(schema, Schema) else Schema(schema)
-
-        def get_all() -> Iterable[List[Any]]:
-            for row in output:
-                yield [row[x] for x in schema.names]
-
-        return IterableDataFrame(get_all(), schema)
+        return IterableDataFrame(_dicts_to_arrays(output, schema.names), schema)
 
     @no_type_check
     def count(self, df: EmptyAwareIterable[Dict[str, Any]]) -> int:
-        return sum(1 for _ in df)
+        return _count_iterable(df)
 
 
 @annotated_param(pd.DataFrame, "p")
 class _PandasParam(LocalDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(self, df: DataFrame, ctx: Any) -> pd.DataFrame:
         return df.as_pandas()
@@ -302,6 +361,8 @@ class _PandasParam(LocalDataFrameParam):
     matcher=lambda x: x == Iterable[pd.DataFrame] or x == Iterator[pd.DataFrame],
 )
 class _IterablePandasParam(LocalDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(self, df: DataFrame, ctx: Any) -> Iterable[pd.DataFrame]:
         if not isinstance(df, LocalDataFrameIterableDataFrame):
@@ -314,9 +375,11 @@ class _IterablePandasParam(LocalDataFrameParam):
     def to_output_df(
         self, output: Iterable[pd.DataFrame], schema: Any, ctx: Any
     ) -> DataFrame:
+        _schema: Optional[Schema] = None if schema is None else Schema(schema)
+
         def dfs():
             for df in output:
-                yield PandasDataFrame(df, schema)
+                yield PandasDataFrame(df, _schema)
 
         return LocalDataFrameIterableDataFrame(dfs())
 
@@ -330,6 +393,8 @@ class _IterablePandasParam(LocalDataFrameParam):
 
 @annotated_param(pa.Table)
 class _PyArrowTableParam(LocalDataFrameParam):
+    __slots__ = ()
+
     def to_input_data(self, df: DataFrame, ctx: Any) -> Any:
         return df.as_arrow()
 
@@ -337,8 +402,8 @@ class _PyArrowTableParam(LocalDataFrameParam):
         assert isinstance(output, pa.Table)
         return ArrowDataFrame(output, schema=schema)
 
-    def count(self, df: Any) -> int:  # pragma: no cover
-        return df.count()
+    def count(self, df: Any) -> int:
+        return df.num_rows
 
     def format_hint(self) -> Optional[str]:
         return "pyarrow"
@@ -349,6 +414,8 @@ class _PyArrowTableParam(LocalDataFrameParam):
     matcher=lambda x: x == Iterable[pa.Table] or x == Iterator[pa.Table],
 )
 class _IterableArrowParam(LocalDataFrameParam):
+    __slots__ = ()
+
     @no_type_check
     def to_input_data(self, df: DataFrame, ctx: Any) -> Iterable[pa.Table]:
         if not isinstance(df, LocalDataFrameIterableDataFrame):
@@ -361,12 +428,17 @@ class _IterableArrowParam(LocalDataFrameParam):
     def to_output_df(
         self, output: Iterable[pa.Table], schema: Any, ctx: Any
     ) -> DataFrame:
+        _schema: Optional[Schema] = None if schema is None else Schema(schema)
+        _pa_schema: Optional[pa.Schema] = None if _schema is None else _schema.pa_schema
+
         def dfs():
-            _schema: Optional[Schema] = None if schema is None else Schema(schema)
             for df in output:
                 adf = ArrowDataFrame(df)
-                if _schema is not None and not (  # pylint: disable-all
-                    adf.schema == schema
+                # comparing the arrow schemas is done in C++, and the common
+                # case of matching schemas doesn't need the field by field
+                # comparison of the Schema objects
+                if _schema is not None and not (
+                    adf.native.schema.equals(_pa_schema) or adf.schema == _schema
                 ):
                     adf = adf[_schema.names].alter_columns(_schema)
                 yield adf
@@ -375,7 +447,7 @@ class _IterableArrowParam(LocalDataFrameParam):
 
     @no_type_check
     def count(self, df: Iterable[pa.Table]) -> int:
-        return sum(_.shape[0] for _ in df)
+        return sum(t.num_rows for t in df)
 
     def format_hint(self) -> Optional[str]:
         return "pyarrow"
@@ -383,4 +455,4 @@ class _IterableArrowParam(LocalDataFrameParam):
 
 @annotated_param(DataFrames, "c")
 class _DataFramesParam(AnnotatedParam):
-    pass
+    __slots__ = ()
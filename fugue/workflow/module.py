@@ -1,6 +1,6 @@
-import copy
 import inspect
-from typing import Any, Callable, Dict, Iterable, Optional
+from itertools import chain
+from typing import Any, Callable, Dict, Optional
 
 from triad import extension_method
 from triad.utils.assertion import assert_or_throw
@@ -46,8 +46,9 @@ def _to_module(
     try:
         f = to_function(obj, global_vars=global_vars, local_vars=local_vars)
         # this is for string expression of function with decorator
+        # the wrapper is immutable, so it can be shared like the case above
         if isinstance(f, _ModuleFunctionWrapper):
-            return copy.copy(f)
+            return f
         # this is for functions without decorator
         return _ModuleFunctionWrapper(f)
     except Exception as e:
@@ -61,17 +62,17 @@ def _to_module(
     matcher=lambda x: inspect.isclass(x) and issubclass(x, FugueWorkflow),
 )
 class _FugueWorkflowParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 @annotated_param(WorkflowDataFrame, "v")
 class _WorkflowDataFrameParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 @annotated_param(WorkflowDataFrames, "u")
 class _WorkflowDataFramesParam(AnnotatedParam):
-    pass
+    __slots__ = ()
 
 
 class _ModuleFunctionWrapper(FunctionWrapper):
@@ -82,82 +83,56 @@ class _ModuleFunctionWrapper(FunctionWrapper):
         return_re: str = "^[uvn]$",
     ):
         super().__init__(func, params_re, return_re)
-
-    def __call__(self, *args: Any, **kwargs: Any) -> Any:
-        if self._need_add_workflow(*args, **kwargs):
-            wf = self._infer_workflow(*args, **kwargs)
-            assert_or_throw(wf is not None, ValueError("can't infer workflow"))
-            return super().__call__(wf, *args, **kwargs)
-        return super().__call__(*args, **kwargs)
-
-    @property
-    def has_input(self) -> bool:
-        return any(
+        # all of these only depend on the parsed annotations, so they are
+        # computed once instead of on every call
+        self.has_input: bool = any(
             isinstance(x, (_WorkflowDataFrameParam, _WorkflowDataFramesParam))
             for x in self._params.values()
         )
-
-    @property
-    def has_dfs_input(self) -> bool:
-        return any(
+        self.has_dfs_input: bool = any(
             isinstance(x, _WorkflowDataFramesParam) for x in self._params.values()
         )
-
-    @property
-    def has_no_output(self) -> bool:
-        return not isinstance(
-            self._rt, (_WorkflowDataFrameParam, _WorkflowDataFramesParam)
+        self.has_single_output: bool = isinstance(self._rt, _WorkflowDataFrameParam)
+        self.has_multiple_output: bool = isinstance(self._rt, _WorkflowDataFramesParam)
+        self.has_no_output: bool = not (
+            self.has_single_output or self.has_multiple_output
+        )
+        has_params = len(self._params) > 0
+        self._first_key: Optional[str] = (
+            self._params.get_key_by_index(0) if has_params else None
+        )
+        self._first_annotation_is_workflow: bool = has_params and isinstance(
+            self._params.get_value_by_index(0), _FugueWorkflowParam
         )
 
-    @property
-    def has_single_output(self) -> bool:
-        return isinstance(self._rt, _WorkflowDataFrameParam)
-
-    @property
-    def has_multiple_output(self) -> bool:
-        return isinstance(self._rt, _WorkflowDataFramesParam)
-
-    @property
-    def _first_annotation_is_workflow(self) -> bool:
-        return isinstance(self._params.get_value_by_index(0), _FugueWorkflowParam)
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self._need_add_workflow(*args, **kwargs):
+            wf = self._infer_workflow(*args, **kwargs)
+            assert_or_throw(wf is not None, ValueError("can't infer workflow"))
+            return super().__call__(wf, *args, **kwargs)
+        return super().__call__(*args, **kwargs)
 
     def _need_add_workflow(self, *args: Any, **kwargs: Any):
-        if not self._first_annotation_is_workflow:
+        if not self._first_annotation_is_workflow or self._first_key in kwargs:
             return False
-        if self._params.get_key_by_index(0) in kwargs:
-            return False
-        if len(args) > 0 and isinstance(args[0], FugueWorkflow):
-            return False
-        return True
+        return len(args) == 0 or not isinstance(args[0], FugueWorkflow)
 
     def _infer_workflow(self, *args: Any, **kwargs: Any) -> Optional[FugueWorkflow]:
-        def select_args() -> Iterable[Any]:
-            for a in args:
-                if isinstance(a, (WorkflowDataFrames, WorkflowDataFrame)):
-                    yield a
-            for _, v in kwargs.items():
-                if isinstance(v, (WorkflowDataFrames, WorkflowDataFrame)):
-                    yield v
-
         wf: Optional[FugueWorkflow] = None
-        for a in select_args():
+        for a in chain(args, kwargs.values()):
             if isinstance(a, WorkflowDataFrame):
-                assert_or_throw(
-                    wf is None or a.workflow is wf,
-                    ValueError("different parenet workflows found on input dataframes"),
-                )
+                if wf is not None and a.workflow is not wf:
+                    raise ValueError(
+                        "different parenet workflows found on input dataframes"
+                    )
                 wf = a.workflow
             elif isinstance(a, WorkflowDataFrames):
                 for k, v in a.items():
-                    assert_or_throw(
-                        isinstance(v, WorkflowDataFrame),
-                        lambda: ValueError(f"{k}:{v} is not a WorkflowDataFrame"),
-                    )
-                    assert_or_throw(
-                        wf is None or v.workflow is wf,
-                        ValueError(
+                    if not isinstance(v, WorkflowDataFrame):
+                        raise ValueError(f"{k}:{v} is not a WorkflowDataFrame")
+                    if wf is not None and v.workflow is not wf:
+                        raise ValueError(
                             "different parenet workflows found on input dataframes"
-                        ),
-                    )
+                        )
                     wf = v.workflow
         return wf
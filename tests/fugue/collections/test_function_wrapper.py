@@ -15,6 +15,9 @@ from fugue import (
     PandasDataFrame,
 )
 from fugue.collections.function_wrapper import (
+    _MATCHED_TYPES,
+    _MATCHED_TYPES_MAX_SIZE,
+    AnnotatedParam,
     FunctionWrapper,
     _CallableParam,
     _NoneParam,
@@ -30,6 +33,10 @@ class _Dummy:
     pass
 
 
+class _Dummy2:
+    pass
+
+
 def test_registration():
     with raises(FuguePluginsRegistrationError):
 
@@ -74,6 +81,30 @@ def test_parse_annotation():
     p = parse_annotation(NativeExecutionEngine)
     assert p.code == "e"
 
+    # cached matching results are invalidated by new registrations
+    assert isinstance(parse_annotation(_Dummy2), _OtherParam)
+
+    @annotated_param(_Dummy2, "_")
+    class _D3(AnnotatedParam):
+        pass
+
+    assert isinstance(parse_annotation(_Dummy2), _D3)
+
+
+def test_parse_annotation_cache_size():
+    backup = dict(_MATCHED_TYPES)
+    try:
+        for i in range(_MATCHED_TYPES_MAX_SIZE + 10):
+            tp = type(f"_T{i}", (), {})
+            p = parse_annotation(tp)
+            assert isinstance(p, _OtherParam)
+            # the cache keeps working after it overflows
+            assert tp in _MATCHED_TYPES
+        assert len(_MATCHED_TYPES) <= _MATCHED_TYPES_MAX_SIZE
+    finally:
+        _MATCHED_TYPES.clear()
+        _MATCHED_TYPES.update(backup)
+
 
 def test_parse_function():
     def _parse_function(f, params_re, return_re):
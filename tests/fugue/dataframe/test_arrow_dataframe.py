@@ -58,3 +58,17 @@ def test_init():
     assert df.is_bounded
 
     raises(Exception, lambda: ArrowDataFrame(123))
+
+
+def test_as_array_iterable_multiple_batches():
+    data = [[i, str(i)] for i in range(20000)]
+    tb = pa.concat_tables(  # two chunks, the second spans multiple batches
+        [
+            ArrowDataFrame(data[:5], "a:long,b:str").native,
+            ArrowDataFrame(data[5:], "a:long,b:str").native,
+        ]
+    )
+    df = ArrowDataFrame(tb)
+    assert data == list(df.as_array_iterable(type_safe=True))
+    assert data == df.as_array(type_safe=True)
+    assert [[x[1]] for x in data] == list(df.as_array_iterable(["b"]))
@@ -16,7 +16,16 @@ from fugue import (
     LocalDataFrameIterableDataFrame,
     PandasDataFrame,
 )
-from fugue.dataframe.function_wrapper import _IterablePandasParam, _IterableArrowParam
+from fugue.dataframe.function_wrapper import (
+    DataFrameParam,
+    _IterableArrowParam,
+    _IterableListParam,
+    _PyArrowTableParam,
+    _IterableDictParam,
+    _IterablePandasParam,
+    _ListDictParam,
+    _PandasParam,
+)
 from fugue.dataframe.utils import _df_eq as df_eq
 from fugue.dev import DataFrameFunctionWrapper
 
@@ -37,6 +46,7 @@ def test_function_wrapper():
     assert 3 == w.run([5], dict(a=1, b=2), ignore_unknown=True)  # dict will overwrite
     assert 3 == w.run([], dict(a=1, b=2, c=4), ignore_unknown=True)
     raises(ValueError, lambda: w.run([], dict(a=1, b=2, c=4), ignore_unknown=False))
+    raises(ValueError, lambda: w.run([1, 2, 3], dict(), ignore_unknown=True))
 
     # test default and required
     w = DataFrameFunctionWrapper(f28)
@@ -108,6 +118,74 @@ def test_function_wrapper_copy():
     assert 3 == test.n
 
 
+def test_dict_params_input():
+    pdf = pd.DataFrame([[0, "x"], [None, None]], columns=["a", "b"])
+    df = PandasDataFrame(pdf, "a:long,b:str")
+    expected = [{"a": 0, "b": "x"}, {"a": None, "b": None}]
+
+    data = _ListDictParam(None).to_input_data(df, ctx=None)
+    assert expected == data
+    assert isinstance(data[0]["a"], int)  # type safe, no numpy types
+
+    data = list(_IterableDictParam(None).to_input_data(df, ctx=None))
+    assert expected == data
+
+
+def test_dict_params_output():
+    p = _ListDictParam(None)
+    data = [{"b": "x", "a": 0, "c": 1}, {"a": 1, "b": None}]
+    odf = p.to_output_df(data, "a:long,b:str", ctx=None)
+    assert odf.is_bounded
+    df_eq(odf, [[0, "x"], [1, None]], "a:long,b:str", throw=True)
+    odf = p.to_output_df(data, "b:str", ctx=None)
+    df_eq(odf, [["x"], [None]], "b:str", throw=True)
+
+    p = _IterableDictParam(None)
+    odf = p.to_output_df(iter(data), "a:long,b:str", ctx=None)
+    df_eq(odf, [[0, "x"], [1, None]], "a:long,b:str", throw=True)
+
+
+def test_dataframe_param_output():
+    p = DataFrameParam(None)
+    df = ArrayDataFrame([[0]], "a:int")
+    assert df is p.to_output_df(df, None, ctx=None)
+    assert df is p.to_output_df(df, "a:int", ctx=None)
+    raises(AssertionError, lambda: p.to_output_df(df, "a:long", ctx=None))
+
+
+def test_count():
+    p = DataFrameParam(None)
+    assert 2 == p.count(ArrayDataFrame([[0], [1]], "a:int"))
+    assert 2 == p.count(IterableDataFrame([[0], [1]], "a:int"))
+    dfs = LocalDataFrameIterableDataFrame(
+        [ArrayDataFrame([[0], [1]], "a:int"), IterableDataFrame([[2]], "a:int")]
+    )
+    assert 3 == p.count(dfs)
+
+    p = _IterableListParam(None)
+    assert 2 == p.count([[0], [1]])
+    assert 2 == p.count(iter([[0], [1]]))
+
+    tb = ArrowDataFrame([[0], [1]], "a:int").native
+    assert 2 == _PyArrowTableParam(None).count(tb)
+    assert 4 == _IterableArrowParam(None).count(iter([tb, tb]))
+
+
+def test_pandas_dataframe():
+    p = _PandasParam(None)
+    pdf = pd.DataFrame([[0]], columns=["a"])
+    assert p.to_input_data(PandasDataFrame(pdf), ctx=None) is pdf
+
+    # no nulls, so arrow could convert the numeric columns zero copy
+    adf = ArrowDataFrame([[0, 1.1, "x"], [1, 2.2, "y"]], "a:long,b:double,c:str")
+    data = p.to_input_data(adf, ctx=None)
+    pd.testing.assert_frame_equal(data, adf.as_pandas())
+    # UDFs can modify the input, the numeric columns must be writable
+    data.loc[data.index[0], "a"] = 100
+    data.loc[data.index[0], "b"] = 100.5
+    assert [100, 100.5] == data[["a", "b"]].iloc[0].tolist()
+
+
 def test_iterable_pandas_dataframes():
     p = _IterablePandasParam(None)
     pdf = pd.DataFrame([[0]], columns=["a"])
@@ -123,6 +201,18 @@ def test_iterable_pandas_dataframes():
     assert data[0] is pdf
     assert data[1] is pdf
 
+    # no nulls, so arrow could convert the numeric columns zero copy
+    adf = ArrowDataFrame([[0, 1.1, "x"], [1, 2.2, "y"]], "a:long,b:double,c:str")
+    dfs = LocalDataFrameIterableDataFrame([adf, adf])
+    data = list(p.to_input_data(dfs, ctx=None))
+    assert 2 == len(data)
+    for d in data:  # arrow dataframes can be consumed more than once
+        pd.testing.assert_frame_equal(d, adf.as_pandas())
+        # UDFs can modify the chunks, the numeric columns must be writable
+        d.loc[d.index[0], "a"] = 100
+        d.loc[d.index[0], "b"] = 100.5
+        assert [100, 100.5] == d[["a", "b"]].iloc[0].tolist()
+
     def get_pdfs():
         yield pdf
         yield pdf
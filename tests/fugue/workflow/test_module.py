@@ -171,6 +171,7 @@ def test_interfaceless():
     assert isinstance(_to_module("i2"), _ModuleFunctionWrapper)
     assert isinstance(_to_module(i3), _ModuleFunctionWrapper)
     assert isinstance(_to_module("i3"), _ModuleFunctionWrapper)
+    assert _to_module("i3") is i3
 
     def i4():
         pass